@@ -1,10 +1,14 @@
 import asyncio
+import functools
 import websockets
-import json
+import orjson
 import re
 from typing import List, Dict, Any
 import openai  # We'll simulate OpenAI API as a placeholder for Claude interaction
 
+# Collapses runs of non-word characters when deriving test filenames
+_SLUG_RE = re.compile(r'\W+')
+
 class ClaudeMCPConnector:
     def __init__(self, 
                  cypress_server_url: str = 'ws://localhost:8765',
@@ -18,6 +22,11 @@ class ClaudeMCPConnector:
         self.cypress_server_url = cypress_server_url
         self.claude_api_key = claude_api_key
         
+        # WebSocket connection shared across a session (see __aenter__),
+        # and the lock serializing callers on it
+        self._ws = None
+        self._ws_lock = None
+        
         # Natural language to Cypress test translation prompts
         self.test_generation_prompt = """
         Convert the following natural language description into a Cypress test script:
@@ -32,6 +41,39 @@ class ClaudeMCPConnector:
         
         Cypress Test Script:
         """
+        
+        # Static pieces of the placeholder test script, split around the
+        # two places the description is inserted
+        self._tpl_head = """
+        describe('Generated Test: """
+        self._tpl_mid = """', () => {
+            it('should perform test based on description', () => {
+                // Automatically generated test
+                cy.log('Test description: """
+        self._tpl_tail = """')
+                
+                // TODO: Implement specific test logic
+                cy.visit('/')  // Example base visit
+                
+                // Placeholder assertion
+                cy.get('body').should('exist')
+            })
+        })
+        """
+        
+        # Scripts are deterministic in the description, so memoize them
+        # per connector instance
+        self._render_script = functools.lru_cache(maxsize=1024)(self._build_script)
+    
+    def _build_script(self, description: str) -> str:
+        """
+        Render the placeholder test script for a description
+        """
+        return ''.join((
+            self._tpl_head, description, 
+            self._tpl_mid, description, 
+            self._tpl_tail
+        ))
     
     async def generate_test_from_description(self, description: str) -> str:
         """
@@ -42,49 +84,155 @@ class ClaudeMCPConnector:
         """
         # Placeholder for actual Claude/OpenAI call
         # In a real implementation, this would use Claude's API
-        test_script = f"""
-        describe('Generated Test: {description}', () => {{
-            it('should perform test based on description', () => {{
-                // Automatically generated test
-                cy.log('Test description: {description}')
-                
-                // TODO: Implement specific test logic
-                cy.visit('/')  // Example base visit
-                
-                // Placeholder assertion
-                cy.get('body').should('exist')
-            }})
-        }})
+        return self._render_script(description)
+    
+    async def _connect(self):
+        """
+        Open a WebSocket connection to the Cypress MCP server
+        """
+        return await websockets.connect(
+            self.cypress_server_url,
+            compression=None
+        )
+    
+    async def __aenter__(self):
+        """
+        Open a WebSocket connection reused by every submit_and_run call
         """
-        return test_script
+        if self._ws is not None:
+            raise RuntimeError("A session connection is already open")
+        self._ws = await self._connect()
+        self._ws_lock = asyncio.Lock()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """
+        Close the session's WebSocket connection
+        """
+        await self._ws.close()
+        self._ws = None
+        self._ws_lock = None
+    
+    def _require_session(self):
+        """
+        Fail clearly when a session method is used outside ``async with``
+        """
+        if self._ws is None:
+            raise RuntimeError(
+                "No session connection is open; use 'async with ClaudeMCPConnector()'"
+            )
+    
+    def _create_test_frame(self, test_description: str, test_script: str) -> str:
+        """
+        Build the create_test frame for a generated script
+        
+        Frames are sent as text, matching the server's JSON protocol.
+        """
+        slug = _SLUG_RE.sub('_', test_description.lower())
+        return orjson.dumps({
+            'type': 'create_test',
+            'filename': f'generated_{slug}.spec.js',
+            'content': test_script
+        }).decode()
+    
+    def _run_tests_frame(self, creation_response: Dict[str, Any]) -> str:
+        """
+        Build the run_tests frame for a freshly created test file
+        """
+        return orjson.dumps({
+            'type': 'run_tests',
+            'specs': [creation_response.get('file_path', '')]
+        }).decode()
+    
+    async def submit_and_run(self, test_description: str) -> Dict[str, Any]:
+        """
+        Generate and run a test over the session's open connection
+        
+        Concurrent callers on one session take turns on the connection;
+        use submit_and_run_batch to overlap their round-trips instead.
+        
+        :param test_description: Natural language test description
+        :return: Test execution results
+        """
+        self._require_session()
+        async with self._ws_lock:
+            return await self._submit_and_run(self._ws, test_description)
+    
+    async def _submit_and_run(self, websocket, test_description: str) -> Dict[str, Any]:
+        """
+        Generate and run a test over the given connection
+        
+        :param websocket: Open connection to the Cypress MCP server
+        :param test_description: Natural language test description
+        :return: Test execution results
+        """
+        # Generate test script
+        test_script = await self.generate_test_from_description(test_description)
+        
+        # Create test file
+        await websocket.send(self._create_test_frame(test_description, test_script))
+        creation_response = orjson.loads(await websocket.recv())
+        
+        # Run the created test
+        await websocket.send(self._run_tests_frame(creation_response))
+        test_results = orjson.loads(await websocket.recv())
+        
+        return test_results
+    
+    async def submit_and_run_batch(self, 
+                                   test_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Generate and run several tests with pipelined frames
+        
+        The server answers frames on a connection in the order it receives
+        them, so all create_test frames are sent before reading any reply,
+        then all run_tests frames likewise. This costs two round-trips for
+        the whole batch instead of two per test.
+        
+        :param test_descriptions: Natural language test descriptions
+        :return: Test execution results, in the order of the descriptions
+        """
+        self._require_session()
+        test_scripts = await asyncio.gather(*(
+            self.generate_test_from_description(description)
+            for description in test_descriptions
+        ))
+        
+        # Hold the connection for the whole batch so replies stay in order
+        async with self._ws_lock:
+            # Create all test files
+            for description, test_script in zip(test_descriptions, test_scripts):
+                await self._ws.send(self._create_test_frame(description, test_script))
+            creation_responses = [
+                orjson.loads(await self._ws.recv()) for _ in test_descriptions
+            ]
+            
+            # Run the created tests
+            for creation_response in creation_responses:
+                await self._ws.send(self._run_tests_frame(creation_response))
+            return [
+                orjson.loads(await self._ws.recv()) for _ in test_descriptions
+            ]
     
     async def run_tests(self, test_description: str) -> Dict[str, Any]:
         """
         Full workflow of generating and running tests
         
+        Reuses the session connection when called inside ``async with``,
+        otherwise opens a connection for this test only.
+        
         :param test_description: Natural language test description
         :return: Test execution results
         """
-        async with websockets.connect(self.cypress_server_url) as websocket:
-            # Generate test script
-            test_script = await self.generate_test_from_description(test_description)
-            
-            # Create test file
-            await websocket.send(json.dumps({
-                'type': 'create_test',
-                'filename': f'generated_{re.sub(r"\W+", "_", test_description.lower())}.spec.js',
-                'content': test_script
-            }))
-            creation_response = await websocket.recv()
-            
-            # Run the created test
-            await websocket.send(json.dumps({
-                'type': 'run_tests',
-                'specs': [creation_response.get('file_path', '')]
-            }))
-            test_results = await websocket.recv()
-            
-            return test_results
+        if self._ws is not None:
+            return await self.submit_and_run(test_description)
+        
+        # One-off connection, kept local so concurrent calls don't share it
+        websocket = await self._connect()
+        try:
+            return await self._submit_and_run(websocket, test_description)
+        finally:
+            await websocket.close()
     
     async def analyze_test_results(self, test_results: Dict[str, Any]) -> str:
         """
@@ -101,17 +249,26 @@ class ClaudeMCPConnector:
 
 # Example usage
 async def main():
-    mcp_connector = ClaudeMCPConnector()
-    
-    # Simulate a test request
-    test_description = "Verify user can log in with valid credentials"
+    # Simulate a batch of test requests
+    test_descriptions = [
+        "Verify user can log in with valid credentials",
+        "Verify user sees an error with invalid credentials"
+    ]
     
-    # Run the test
-    test_results = await mcp_connector.run_tests(test_description)
-    
-    # Analyze and print results
-    result_summary = await mcp_connector.analyze_test_results(test_results)
-    print(result_summary)
+    # Run the tests over a single connection
+    async with ClaudeMCPConnector() as mcp_connector:
+        batch_results = await mcp_connector.submit_and_run_batch(test_descriptions)
+        
+        # Analyze and print results
+        for test_results in batch_results:
+            result_summary = await mcp_connector.analyze_test_results(test_results)
+            print(result_summary)
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv-based event loop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
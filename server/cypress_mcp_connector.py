@@ -1,11 +1,16 @@
 import os
-import json
+import shutil
+import signal
 import asyncio
+import contextlib
 import websockets
-import subprocess
 import logging
 from typing import List, Dict, Any
 
+# Configure logging once at import rather than per instance
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+
 class CypressMCPConnector:
     def __init__(self, project_path: str):
         """
@@ -15,7 +20,13 @@ class CypressMCPConnector:
         """
         self.project_path = project_path
         self.logger = logging.getLogger('CypressMCPConnector')
-        logging.basicConfig(level=logging.INFO)
+        
+        # Cached test listing, invalidated when cypress/e2e changes
+        self._tests_cache = None
+        self._tests_mtime = 0
+        
+        # Resolve the Cypress executable once instead of going through npx
+        self._cypress_cmd = self.resolve_cypress_command()
         
         # Validate project structure
         self.validate_project_structure()
@@ -24,14 +35,36 @@ class CypressMCPConnector:
         """
         Validate the Cypress project structure
         """
-        required_dirs = ['cypress', 'cypress/e2e', 'cypress/fixtures']
-        for dir_path in required_dirs:
-            full_path = os.path.join(self.project_path, dir_path)
-            if not os.path.exists(full_path):
+        cypress_path = os.path.join(self.project_path, 'cypress')
+        try:
+            with os.scandir(cypress_path) as entries:
+                subdirs = {entry.name for entry in entries if entry.is_dir()}
+        except (FileNotFoundError, NotADirectoryError):
+            raise ValueError(f"Missing required directory: {cypress_path}")
+        
+        for dir_name in ('e2e', 'fixtures'):
+            if dir_name not in subdirs:
+                full_path = os.path.join(cypress_path, dir_name)
                 raise ValueError(f"Missing required directory: {full_path}")
         
         self.logger.info(f"Validated Cypress project at {self.project_path}")
     
+    def resolve_cypress_command(self) -> List[str]:
+        """
+        Locate the Cypress executable for this project
+        
+        :return: Command prefix used to invoke Cypress
+        """
+        local_bin = os.path.join(self.project_path, 'node_modules', '.bin', 'cypress')
+        if os.access(local_bin, os.X_OK):
+            return [local_bin]
+        
+        global_bin = shutil.which('cypress')
+        if global_bin:
+            return [global_bin]
+        
+        return ['npx', 'cypress']
+    
     def list_available_tests(self) -> List[str]:
         """
         List all available Cypress test files
@@ -39,54 +72,117 @@ class CypressMCPConnector:
         :return: List of test file paths relative to cypress/e2e
         """
         integration_path = os.path.join(self.project_path, 'cypress', 'e2e')
-        test_files = [
-            os.path.join('cypress', 'e2e', f) 
-            for f in os.listdir(integration_path) 
-            if f.endswith('.cy.js') or f.endswith('.cy.ts')
-        ]
+        mtime = os.stat(integration_path).st_mtime_ns
+        if mtime == self._tests_mtime and self._tests_cache is not None:
+            return list(self._tests_cache)
+        
+        prefix = os.path.join('cypress', 'e2e', '')
+        with os.scandir(integration_path) as entries:
+            test_files = [
+                prefix + entry.name 
+                for entry in entries 
+                if entry.name.endswith(('.cy.js', '.cy.ts'))
+                and entry.is_file(follow_symlinks=False)
+            ]
+        
+        # Stored as a tuple so callers can't mutate the cached listing
+        self._tests_cache = tuple(test_files)
+        self._tests_mtime = mtime
         return test_files
     
-    def run_cypress_tests(self, 
-                           test_specs: List[str] = None, 
-                           browser: str = 'chrome') -> Dict[str, Any]:
+    async def run_cypress_tests(self, 
+                                 test_specs: List[str] = None, 
+                                 browser: str = 'chrome',
+                                 parallelism: int = None) -> Dict[str, Any]:
         """
         Run Cypress tests with specified configuration
         
+        Specs are sharded across concurrent Cypress processes, each running
+        its own subset, and the shard results are merged.
+        
         :param test_specs: List of specific test files to run
         :param browser: Browser to use for testing
+        :param parallelism: Maximum number of concurrent Cypress processes
+                            (defaults to half the CPU count)
         :return: Test execution results
         """
         # If no test_specs provided, run all tests
         if not test_specs:
             test_specs = self.list_available_tests()
         
-        # Prepare Cypress command
+        if parallelism is None:
+            parallelism = (os.cpu_count() or 2) // 2
+        shard_count = max(1, min(parallelism, len(test_specs)))
+        
+        # Round-robin so every shard gets a similar number of specs
+        shards = [test_specs[i::shard_count] for i in range(shard_count)]
+        if shard_count == 1:
+            results = [await self._run_one_shard(shards[0], browser)]
+        else:
+            results = await asyncio.gather(*(
+                self._run_one_shard(shard, browser, f'shard-{i}')
+                for i, shard in enumerate(shards, 1)
+            ))
+        return self._merge_shard_results(results)
+    
+    async def _run_one_shard(self, 
+                             test_specs: List[str], 
+                             browser: str,
+                             shard_name: str = None) -> Dict[str, Any]:
+        """
+        Run a single Cypress process over a subset of specs
+        
+        :param test_specs: Test files handled by this shard
+        :param browser: Browser to use for testing
+        :param shard_name: Subfolder for this shard's assets when several
+                           shards run concurrently
+        :return: Test execution results for the shard
+        """
+        # Prepare Cypress command. Cypress reads --spec as a single
+        # comma-separated value; repeating the flag keeps only the last one.
         cypress_cmd = [
-            'npx', 'cypress', 'run',
+            *self._cypress_cmd, 'run',
             '--browser', browser,
             '--spec', ','.join(test_specs)
         ]
         
+        if shard_name:
+            # Cypress trashes its asset folders at the start of each run
+            # (trashAssetsBeforeRuns), so concurrent shards sharing them
+            # would wipe each other's screenshots, videos and downloads
+            cypress_cmd += ['--config', ','.join(
+                f'{key}=cypress/{folder}/{shard_name}'
+                for key, folder in (
+                    ('screenshotsFolder', 'screenshots'),
+                    ('videosFolder', 'videos'),
+                    ('downloadsFolder', 'downloads')
+                )
+            )]
+        
         try:
-            # Change to project directory
-            original_dir = os.getcwd()
-            os.chdir(self.project_path)
-            
-            # Run tests
-            result = subprocess.run(
-                cypress_cmd, 
-                capture_output=True, 
-                text=True
+            # Run tests from the project directory
+            proc = await asyncio.create_subprocess_exec(
+                *cypress_cmd, 
+                stdout=asyncio.subprocess.PIPE, 
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.project_path,
+                # Own process group, so the Electron runner the CLI
+                # spawns can be killed along with it
+                start_new_session=True
             )
-            
-            # Return to original directory
-            os.chdir(original_dir)
+            try:
+                stdout, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                # Don't leave an orphaned Cypress run behind
+                self._kill_process_group(proc)
+                await proc.wait()
+                raise
             
             return {
-                'success': result.returncode == 0,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'return_code': result.returncode
+                'success': proc.returncode == 0,
+                'stdout': stdout.decode(errors='replace'),
+                'stderr': stderr.decode(errors='replace'),
+                'return_code': proc.returncode
             }
         
         except Exception as e:
@@ -95,6 +191,51 @@ class CypressMCPConnector:
                 'error': str(e)
             }
     
+    def _kill_process_group(self, proc: asyncio.subprocess.Process):
+        """
+        Kill a Cypress process and every child it started
+        
+        :param proc: Process started with start_new_session=True
+        """
+        # The child may already have exited; that must not turn a
+        # cancellation into an error result
+        with contextlib.suppress(ProcessLookupError):
+            if hasattr(os, 'killpg'):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+    
+    def _merge_shard_results(self, 
+                             results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine per-shard results into a single test run result
+        
+        :param results: Results returned by each shard
+        :return: Merged test execution results
+        """
+        if len(results) == 1:
+            return results[0]
+        
+        merged = {'success': all(r['success'] for r in results)}
+        
+        # Only shards whose process actually ran contribute output
+        completed = [r for r in results if 'return_code' in r]
+        if completed:
+            merged['stdout'] = '\n'.join(r['stdout'] for r in completed if r['stdout'])
+            merged['stderr'] = '\n'.join(r['stderr'] for r in completed if r['stderr'])
+        
+        # A return code is only meaningful if every shard produced one
+        if len(completed) == len(results):
+            merged['return_code'] = next(
+                (r['return_code'] for r in completed if r['return_code'] != 0), 0
+            )
+        
+        errors = [r['error'] for r in results if 'error' in r]
+        if errors:
+            merged['error'] = '\n'.join(errors)
+        
+        return merged
+    
     def create_test_file(self, 
                           filename: str, 
                           content: str) -> Dict[str, Any]:
@@ -111,13 +252,21 @@ class CypressMCPConnector:
         file_path = os.path.join(
             self.project_path, 
             'cypress', 
-            'integration', 
+            'e2e', 
             filename
         )
         
         try:
-            with open(file_path, 'w') as f:
-                f.write(content)
+            data = content.encode() if isinstance(content, str) else content
+            
+            # Small one-shot write, so skip the buffered text layer
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
             
             return {
                 'success': True,
@@ -130,7 +279,7 @@ class CypressMCPConnector:
             }
 
 # Example usage
-def main():
+async def main():
     connector = CypressMCPConnector("/Users/dodosaurus/Documents/LOCAL/cypress-mcp")
     
     # List available tests
@@ -138,8 +287,8 @@ def main():
     print("Available Tests:", available_tests)
     
     # Run all tests
-    test_results = connector.run_cypress_tests()
+    test_results = await connector.run_cypress_tests()
     print("Test Results:", test_results)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,9 +1,59 @@
+import os
 import asyncio
+import collections
 import websockets
-import json
+import orjson
 import logging
+from typing import Dict, Any
 from cypress_mcp_connector import CypressMCPConnector
 
+# Configure logging once at import rather than per instance
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+
+class _Outbox:
+    def __init__(self):
+        """
+        Queue of pre-serialized frames drained by a single writer task
+        """
+        self._frames = collections.deque()
+        self._wake = None
+        self._closed = False
+    
+    def push(self, frame: bytes):
+        """
+        Queue a frame and wake the writer if it is idle
+        """
+        self._frames.append(frame)
+        self._notify()
+    
+    def close(self):
+        """
+        Let the writer exit once the queued frames are sent
+        """
+        self._closed = True
+        self._notify()
+    
+    def _notify(self):
+        if self._wake is not None and not self._wake.done():
+            self._wake.set_result(None)
+    
+    async def drain(self, websocket):
+        """
+        Send queued frames in order until the outbox is closed
+        """
+        while True:
+            if self._frames:
+                # orjson produces UTF-8 bytes; send them as text frames so
+                # JSON clients (e.g. JSON.parse(event.data)) keep working
+                await websocket.send(self._frames.popleft().decode())
+            elif self._closed:
+                return
+            else:
+                self._wake = asyncio.get_running_loop().create_future()
+                await self._wake
+                self._wake = None
+
 class CypressMCPServer:
     def __init__(self, 
                  project_path: str, 
@@ -13,7 +63,25 @@ class CypressMCPServer:
         self.host = host
         self.port = port
         self.logger = logging.getLogger('CypressMCPServer')
-        logging.basicConfig(level=logging.INFO)
+        
+        # Upper bound on client-requested concurrent Cypress processes
+        self.max_parallelism = os.cpu_count() or 1
+        
+        # Pre-encoded openings of each response shape; only the variable
+        # part is serialized per message
+        self._tpl_test_list = b'{"type":"test_list","tests":'
+        self._tpl_test_results = b'{"type":"test_results",'
+        self._tpl_test_creation = b'{"type":"test_creation",'
+        self._tpl_error = b'{"type":"error","message":'
+    
+    def _typed_frame(self, template: bytes, fields: Dict[str, Any]) -> bytes:
+        """
+        Append a serialized field dict to a pre-encoded response opening
+        """
+        body = orjson.dumps(fields)
+        if body == b'{}':
+            return template[:-1] + b'}'
+        return template + body[1:]
     
     async def handle_message(self, websocket, path):
         """
@@ -23,55 +91,79 @@ class CypressMCPServer:
         - list_tests: List available test files
         - run_tests: Execute specified or all tests
         - create_test: Generate a new test file
+        
+        Replies are queued on a per-connection outbox and sent by a
+        separate writer task, so decoding and dispatching the next
+        message does not wait on the socket.
+        """
+        outbox = _Outbox()
+        writer = asyncio.create_task(outbox.drain(websocket))
+        try:
+            await self._dispatch_messages(websocket, outbox)
+        finally:
+            outbox.close()
+            try:
+                await writer
+            except websockets.ConnectionClosed:
+                pass
+    
+    async def _dispatch_messages(self, websocket, outbox: _Outbox):
+        """
+        Decode incoming messages and queue their responses
         """
         async for message in websocket:
             try:
-                msg_data = json.loads(message)
-                response = {}
+                msg_data = orjson.loads(message)
+                msg_type = msg_data.get('type')
+                response = b'{}'
                 
-                if msg_data.get('type') == 'list_tests':
-                    response = {
-                        'type': 'test_list',
-                        'tests': self.connector.list_available_tests()
-                    }
+                if msg_type == 'list_tests':
+                    tests = self.connector.list_available_tests()
+                    response = self._tpl_test_list + orjson.dumps(tests) + b'}'
                 
-                elif msg_data.get('type') == 'run_tests':
+                elif msg_type == 'run_tests':
                     test_specs = msg_data.get('specs')
                     browser = msg_data.get('browser', 'chrome')
+                    parallelism = msg_data.get('parallelism')
+                    if parallelism is not None:
+                        parallelism = min(max(int(parallelism), 1), self.max_parallelism)
                     
-                    response = {
-                        'type': 'test_results',
-                        **self.connector.run_cypress_tests(
-                            test_specs, 
-                            browser
-                        )
-                    }
+                    results = await self.connector.run_cypress_tests(
+                        test_specs, 
+                        browser,
+                        parallelism
+                    )
+                    response = self._typed_frame(self._tpl_test_results, results)
                 
-                elif msg_data.get('type') == 'create_test':
+                elif msg_type == 'create_test':
                     filename = msg_data.get('filename')
                     content = msg_data.get('content')
                     
-                    response = {
-                        'type': 'test_creation',
-                        **self.connector.create_test_file(filename, content)
-                    }
+                    creation = await asyncio.to_thread(
+                        self.connector.create_test_file,
+                        filename,
+                        content
+                    )
+                    response = self._typed_frame(self._tpl_test_creation, creation)
                 
-                await websocket.send(json.dumps(response))
+                outbox.push(response)
             
             except Exception as e:
-                await websocket.send(json.dumps({
-                    'type': 'error',
-                    'message': str(e)
-                }))
+                outbox.push(self._tpl_error + orjson.dumps(str(e)) + b'}')
     
     async def start_server(self):
         """
         Start the WebSocket server
         """
+        # MCP frames are small JSON messages on a local socket, so
+        # permessage-deflate costs more CPU than it saves bandwidth
         server = await websockets.serve(
             self.handle_message, 
             self.host, 
-            self.port
+            self.port,
+            compression=None,
+            max_size=2**20,
+            max_queue=64
         )
         self.logger.info(f"Cypress MCP Server running on {self.host}:{self.port}")
         await server.wait_closed()
@@ -83,4 +175,10 @@ async def main():
     await server.start_server()
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    # Prefer the libuv-based event loop when it is installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file